@@ -1,42 +1,157 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 from datetime import datetime
 from collections import deque
+from functools import wraps
+from bisect import bisect_left, insort
+import itertools
 import json
-import random
-import string
+import time
+import uuid
+import orjson
+from readerwriterlock.rwlock import RWLockFair
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend communication
 
+_booking_counter = itertools.count()
+
+
+class _Timestamp:
+    """Wall-clock time in nanoseconds, formatted as ISO 8601 only when serialized"""
+    __slots__ = ('ns',)
+    
+    def __init__(self, ns):
+        self.ns = ns
+    
+    def isoformat(self):
+        return datetime.fromtimestamp(self.ns / 1e9).isoformat()
+
+
+def _json_default(obj):
+    """orjson fallback for values it cannot encode natively"""
+    if isinstance(obj, _Timestamp):
+        return obj.isoformat()
+    raise TypeError
+
+
+def _json(obj):
+    """Serialize a large payload with orjson instead of jsonify"""
+    return Response(orjson.dumps(obj, default=_json_default), mimetype='application/json')
+
+
+# One bit per facility; facilities not listed here get the next free bit when a room declares them
+FACILITY_BITS = {
+    'projector': 1 << 0,
+    'lab': 1 << 1,
+    'accessible': 1 << 2,
+    'whiteboard': 1 << 3,
+    'audio': 1 << 4,
+    'smartboard': 1 << 5,
+}
+
+
+def _facility_mask(facilities):
+    """Encode a room's facilities flagged True as a bitmask, registering new ones"""
+    mask = 0
+    for facility, present in facilities.items():
+        if present:
+            mask |= FACILITY_BITS.setdefault(facility, 1 << len(FACILITY_BITS))
+    return mask
+
+
+def _required_facility_mask(facilities):
+    """Encode requested facilities without registering them; None if any is unknown"""
+    mask = 0
+    for facility, required in facilities.items():
+        if required:
+            bit = FACILITY_BITS.get(facility)
+            if bit is None:
+                return None
+            mask |= bit
+    return mask
+
+
+def _similar_capacity(capacity1, capacity2):
+    """Rooms are adjacent when capacities differ by at most 25% of the larger one"""
+    return abs(capacity1 - capacity2) / max(capacity1, capacity2) <= 0.25
+
+
+def _to_minutes(time_str):
+    """Convert an 'HH:MM' string to minutes since midnight (ValueError if malformed)"""
+    try:
+        hours, minutes = time_str.split(':')[:2]
+        return int(hours) * 60 + int(minutes)
+    except (AttributeError, TypeError, ValueError):
+        raise ValueError(f"Invalid time: {time_str!r}") from None
+
+
+def _to_time_range(start_time, end_time):
+    """Convert a start/end pair to minutes (ValueError if malformed or end is not after start)"""
+    start_min = _to_minutes(start_time)
+    end_min = _to_minutes(end_time)
+    if end_min <= start_min:
+        raise ValueError(f"End time {end_time!r} is not after start time {start_time!r}")
+    return start_min, end_min
+
+
+def _overlapping_pairs(intervals):
+    """Return (earlier, later) index pairs of overlapping intervals.
+
+    intervals must be sorted (start_min, end_min, index) tuples; only intervals
+    still open at each start are compared, so the scan is linear for clean schedules.
+    """
+    pairs = []
+    active = []
+    for start_min, end_min, idx in intervals:
+        active = [entry for entry in active if entry[0] > start_min]
+        for _, other_idx in active:
+            pairs.append((other_idx, idx))
+        active.append((end_min, idx))
+    return pairs
+
+
 class ClassroomNode:
     """Node in the classroom graph"""
     def __init__(self, room_id, building, capacity, floor, facilities):
         self.room_id = room_id
         self.building = building
+        self.building_id = None  # Interned by ClassroomGraph for fast comparisons
         self.capacity = capacity
         self.floor = floor
         self.facilities = facilities
-        self.adjacent_rooms = []
+        self.facility_mask = _facility_mask(facilities)
+        self.adjacent_rooms = {}  # room_id -> None; a dict keeps insertion order with O(1) lookups
+        self.adjacent_indices = []  # Graph indexes of adjacent_rooms, for traversal
         self.bookings = []
+        self.bookings_by_date = {}  # date -> sorted list of (start_min, end_min, booking index)
+        self._conflicts = []
+        self._sorted_dirty = False
+        self._dict_cache = None
     
-    def add_adjacent(self, room_id):
+    def add_adjacent(self, room_id, room_index):
         """Add adjacent room connection"""
         if room_id not in self.adjacent_rooms:
-            self.adjacent_rooms.append(room_id)
+            self.adjacent_rooms[room_id] = None
+            self.adjacent_indices.append(room_index)
+            self._dict_cache = None
     
-    def is_available(self, date, start_time, end_time):
-        """Check if room is available for given time slot"""
-        for booking in self.bookings:
-            if booking['date'] == date:
-                # Check for time overlap
-                if not (end_time <= booking['start_time'] or start_time >= booking['end_time']):
-                    return False
-        return True
+    def is_available(self, date, start_min, end_min):
+        """Check if room is available for given time slot (minutes since midnight)"""
+        intervals = self.bookings_by_date.get(date)
+        if not intervals:
+            return True
+        
+        # Bookings are only admitted when the slot is free, so a date's intervals
+        # never overlap and the one starting right before end_time is the only candidate
+        idx = bisect_left(intervals, (end_min,))
+        return idx == 0 or intervals[idx - 1][1] <= start_min
     
     def add_booking(self, date, start_time, end_time, course_name, instructor):
         """Add a booking to the room"""
         booking_id = self.generate_booking_id()
+        start_min = _to_minutes(start_time)
+        end_min = _to_minutes(end_time)
         self.bookings.append({
             'date': date,
             'start_time': start_time,
@@ -44,28 +159,52 @@ class ClassroomNode:
             'course_name': course_name,
             'instructor': instructor,
             'booking_id': booking_id,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _Timestamp(time.time_ns())
         })
+        insort(
+            self.bookings_by_date.setdefault(date, []),
+            (start_min, end_min, len(self.bookings) - 1)
+        )
+        self._sorted_dirty = True
+        self._dict_cache = None
         return booking_id
     
+    def detect_conflicts(self):
+        """Detect overlapping bookings in this room, reusing the last scan if unchanged"""
+        if not self._sorted_dirty:
+            return self._conflicts
+        
+        conflicts = []
+        for date in sorted(self.bookings_by_date):
+            for idx1, idx2 in _overlapping_pairs(self.bookings_by_date[date]):
+                conflicts.append({
+                    'room_id': self.room_id,
+                    'booking1': self.bookings[idx1],
+                    'booking2': self.bookings[idx2]
+                })
+        
+        self._conflicts = conflicts
+        self._sorted_dirty = False
+        return conflicts
+    
     @staticmethod
     def generate_booking_id():
         """Generate unique booking ID"""
-        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-        random_str = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-        return f"BK{timestamp}{random_str}"
+        return f"BK{time.time_ns():016x}{next(_booking_counter):x}"
     
     def to_dict(self):
-        """Convert node to dictionary"""
-        return {
-            'room_id': self.room_id,
-            'building': self.building,
-            'capacity': self.capacity,
-            'floor': self.floor,
-            'facilities': self.facilities,
-            'adjacent_rooms': self.adjacent_rooms,
-            'bookings_count': len(self.bookings)
-        }
+        """Convert node to dictionary (cached until bookings or adjacency change)"""
+        if self._dict_cache is None:
+            self._dict_cache = {
+                'room_id': self.room_id,
+                'building': self.building,
+                'capacity': self.capacity,
+                'floor': self.floor,
+                'facilities': self.facilities,
+                'adjacent_rooms': list(self.adjacent_rooms),
+                'bookings_count': len(self.bookings)
+            }
+        return self._dict_cache
 
 
 class ClassroomGraph:
@@ -73,223 +212,302 @@ class ClassroomGraph:
     def __init__(self):
         self.rooms = {}  # Dictionary: room_id -> ClassroomNode
         self.allocation_queue = deque()  # Queue for pending requests
-        self.logs = []
+        self.logs = deque(maxlen=100)  # Keep only last 100 logs
+        self.building_index = {}  # building_id -> [room_id, ...]
+        self._building_id = {}  # building name -> small int id
+        self.capacity_index = []  # sorted list of (capacity, position in _rooms_list)
+        self._room_index = {}  # room_id -> position in _rooms_list
+        self._rooms_list = []
+        self.version = 0  # Bumped on every mutation; used as the ETag of read endpoints
+        self._total_bookings = 0
+        self._utilized_rooms = 0
+        self._conflicts_count = 0
+        self._conflicts_version = -1
+        # Readers share the graph; add_room/bulk_add_rooms/allocate_room take it exclusively
+        self._lock = RWLockFair()
     
     def add_room(self, room_id, building, capacity, floor, facilities):
         """Add a room to the graph"""
-        if room_id in self.rooms:
-            return False, "Room already exists"
-        
+        with self._lock.gen_wlock():
+            if room_id in self.rooms:
+                return False, "Room already exists"
+            
+            self._insert_room(room_id, building, capacity, floor, facilities)
+            
+            # Create edges based on adjacency rules
+            self._create_edges(room_id)
+            self.version += 1
+            
+            self.add_log('info', f"Added room {building} {room_id} to system")
+            return True, "Room added successfully"
+    
+    def bulk_add_rooms(self, rooms):
+        """
+        Add several rooms, building adjacency once after all are inserted
+        Returns: number of rooms added
+        """
+        with self._lock.gen_wlock():
+            new_ids = []
+            for room_id, building, capacity, floor, facilities in rooms:
+                if room_id in self.rooms:
+                    self.add_log('error', f"Room {building} {room_id} already exists")
+                    continue
+                self._insert_room(room_id, building, capacity, floor, facilities)
+                new_ids.append(room_id)
+                self.add_log('info', f"Added room {building} {room_id} to system")
+            
+            if not new_ids:
+                return 0
+            
+            # Each new room links to the earlier rooms in its building bucket and bisect
+            # capacity window, so the cost follows the batch size, not the graph size
+            for room_id in new_ids:
+                self._create_edges(room_id)
+            
+            self.version += 1
+            return len(new_ids)
+    
+    def _insert_room(self, room_id, building, capacity, floor, facilities):
+        """Create a node and register it in the lookup indexes (no edges)"""
         room = ClassroomNode(room_id, building, capacity, floor, facilities)
+        room_index = len(self._rooms_list)
+        # Insert into the sorted index first: it is the only step that can fail, and
+        # nothing else has been registered yet if it does
+        insort(self.capacity_index, (capacity, room_index))
+        room.building_id = self._intern_building(building)
         self.rooms[room_id] = room
-        
-        # Create edges based on adjacency rules
-        self._create_edges(room_id)
-        
-        self.add_log('info', f"Added room {building} {room_id} to system")
-        return True, "Room added successfully"
+        self._room_index[room_id] = room_index
+        self._rooms_list.append(room)
+        self.building_index.setdefault(room.building_id, []).append(room_id)
+        return room
+    
+    def _intern_building(self, name):
+        """Map a building name to its int id, assigning the next one if new"""
+        return self._building_id.setdefault(name, len(self._building_id))
+    
+    def _link(self, room_id1, room_id2):
+        """Add an undirected edge between two rooms"""
+        index1 = self._room_index[room_id1]
+        index2 = self._room_index[room_id2]
+        self._rooms_list[index1].add_adjacent(room_id2, index2)
+        self._rooms_list[index2].add_adjacent(room_id1, index1)
     
     def _create_edges(self, new_room_id):
         """Create edges between rooms based on adjacency rules"""
         new_room = self.rooms[new_room_id]
         
-        for room_id, room in self.rooms.items():
-            if room_id == new_room_id:
-                continue
-            
-            # Connect rooms in same building
-            if room.building == new_room.building:
-                new_room.add_adjacent(room_id)
-                room.add_adjacent(new_room_id)
-            
-            # Connect rooms with similar capacity (within 25%)
-            capacity_diff = abs(room.capacity - new_room.capacity)
-            max_capacity = max(room.capacity, new_room.capacity)
-            if capacity_diff / max_capacity <= 0.25:
-                new_room.add_adjacent(room_id)
-                room.add_adjacent(new_room_id)
+        # Connect rooms in same building
+        neighbours = dict.fromkeys(self.building_index[new_room.building_id])
+        
+        # Connect rooms with similar capacity (within 25% of the larger one),
+        # i.e. capacities in [0.75 * capacity, capacity / 0.75]
+        idx = bisect_left(self.capacity_index, (new_room.capacity * 0.75,))
+        while idx < len(self.capacity_index):
+            capacity, room_index = self.capacity_index[idx]
+            if capacity > new_room.capacity / 0.75:
+                break
+            if _similar_capacity(capacity, new_room.capacity):
+                neighbours[self._rooms_list[room_index].room_id] = None
+            idx += 1
+        
+        # Link only to rooms inserted earlier, in insertion order, so adjacency (and BFS
+        # order) matches a full scan of self.rooms even when bulk_add_rooms indexed later ones
+        new_index = self._room_index[new_room_id]
+        earlier = [room_id for room_id in neighbours if self._room_index[room_id] < new_index]
+        for room_id in sorted(earlier, key=self._room_index.__getitem__):
+            self._link(new_room_id, room_id)
     
     def allocate_room(self, requirements):
         """
         Allocate a room using graph-based algorithm
         Returns: (success, result, booking_id)
         """
-        course_name = requirements['course_name']
-        instructor = requirements.get('instructor', '')
-        date = requirements['date']
-        start_time = requirements['start_time']
-        end_time = requirements['end_time']
-        capacity = requirements['capacity']
-        building = requirements.get('building', '')
-        facilities = requirements['facilities']
-        
-        self.add_log('info', f"Processing allocation for {course_name}")
-        
-        # Find suitable rooms using graph traversal
-        suitable_rooms = []
-        
-        for room_id, room in self.rooms.items():
-            # Check capacity
-            if room.capacity < capacity:
-                continue
+        with self._lock.gen_wlock():
+            course_name = requirements['course_name']
+            instructor = requirements.get('instructor', '')
+            date = requirements['date']
+            start_time = requirements['start_time']
+            end_time = requirements['end_time']
+            capacity = requirements['capacity']
+            building = requirements.get('building', '')
+            facilities = requirements['facilities']
             
-            # Check building preference
-            if building and room.building != building:
-                continue
+            try:
+                start_min, end_min = _to_time_range(start_time, end_time)
+            except ValueError:
+                self.add_log('error', f"Invalid time format for {course_name}")
+                return False, "Invalid time format", None
             
-            # Check facilities
-            facilities_match = all(
-                room.facilities.get(facility, False)
-                for facility, required in facilities.items()
-                if required
-            )
+            self.add_log('info', f"Processing allocation for {course_name}")
             
-            if not facilities_match:
-                continue
+            required_mask = _required_facility_mask(facilities)
+            # Unknown buildings get an id no room has, so nothing matches them
+            building_id = self._building_id.get(building, -1)
             
-            # Check availability
-            if room.is_available(date, start_time, end_time):
-                suitable_rooms.append(room)
-        
-        if not suitable_rooms:
-            self.add_log('error', f"No suitable rooms for {course_name}")
-            return False, "No rooms match requirements or are available", None
-        
-        # Select best room (closest capacity match)
-        best_room = min(suitable_rooms, key=lambda r: abs(r.capacity - capacity))
-        
-        # Book the room
-        booking_id = best_room.add_booking(date, start_time, end_time, course_name, instructor)
-        
-        self.add_log('success', f"Allocated {best_room.building} {best_room.room_id} for {course_name} (ID: {booking_id})")
-        
-        return True, best_room.to_dict(), booking_id
+            # Rooms below the requested size sit before this point in the capacity index,
+            # so walking upward from here visits candidates from closest capacity match outward;
+            # equal capacities are ordered by insertion, so ties go to the earliest-added room
+            best_room = None
+            start = bisect_left(self.capacity_index, (capacity,))
+            # A facility no room has ever declared cannot be matched, so skip the search
+            candidates = () if required_mask is None else itertools.islice(self.capacity_index, start, None)
+            
+            for _, room_index in candidates:
+                room = self._rooms_list[room_index]
+                
+                # Check building preference
+                if building and room.building_id != building_id:
+                    continue
+                
+                # Check facilities
+                if (room.facility_mask & required_mask) != required_mask:
+                    continue
+                
+                # Check availability
+                if room.is_available(date, start_min, end_min):
+                    best_room = room
+                    break
+            
+            if best_room is None:
+                self.add_log('error', f"No suitable rooms for {course_name}")
+                return False, "No rooms match requirements or are available", None
+            
+            # Book the room
+            if not best_room.bookings:
+                self._utilized_rooms += 1
+            booking_id = best_room.add_booking(date, start_time, end_time, course_name, instructor)
+            self._total_bookings += 1
+            self.version += 1
+            
+            self.add_log('success', f"Allocated {best_room.building} {best_room.room_id} for {course_name} (ID: {booking_id})")
+            
+            return True, best_room.to_dict(), booking_id
     
     def get_room(self, room_id):
         """Get room details"""
-        room = self.rooms.get(room_id)
-        if room:
-            return room.to_dict()
-        return None
+        with self._lock.gen_rlock():
+            room = self.rooms.get(room_id)
+            if room:
+                return room.to_dict()
+            return None
     
     def get_all_rooms(self):
         """Get all rooms"""
-        return [room.to_dict() for room in self.rooms.values()]
+        with self._lock.gen_rlock():
+            return [room.to_dict() for room in self.rooms.values()]
     
     def get_schedule(self, room_id=None):
         """Get schedule for specific room or all rooms"""
-        schedules = []
-        
-        if room_id:
-            room = self.rooms.get(room_id)
-            if room:
-                for booking in room.bookings:
-                    schedules.append({
-                        'room': room.to_dict(),
-                        'booking': booking
-                    })
-        else:
-            for room in self.rooms.values():
-                for booking in room.bookings:
-                    schedules.append({
-                        'room': room.to_dict(),
-                        'booking': booking
-                    })
-        
-        return schedules
+        with self._lock.gen_rlock():
+            schedules = []
+            
+            if room_id:
+                room = self.rooms.get(room_id)
+                if room:
+                    for booking in room.bookings:
+                        schedules.append({
+                            'room': room.to_dict(),
+                            'booking': booking
+                        })
+            else:
+                for room in self.rooms.values():
+                    for booking in room.bookings:
+                        schedules.append({
+                            'room': room.to_dict(),
+                            'booking': booking
+                        })
+            
+            return schedules
     
     def detect_conflicts(self):
         """Detect scheduling conflicts"""
+        with self._lock.gen_rlock():
+            return self._detect_conflicts()
+    
+    def _detect_conflicts(self):
+        """Collect conflicts from every room; caller must hold the lock"""
         conflicts = []
         
         for room in self.rooms.values():
-            bookings = sorted(room.bookings, key=lambda x: (x['date'], x['start_time']))
-            
-            for i in range(len(bookings)):
-                for j in range(i + 1, len(bookings)):
-                    b1 = bookings[i]
-                    b2 = bookings[j]
-                    
-                    if b1['date'] == b2['date']:
-                        # Check for overlap
-                        if not (b1['end_time'] <= b2['start_time'] or b2['end_time'] <= b1['start_time']):
-                            conflicts.append({
-                                'room_id': room.room_id,
-                                'booking1': b1,
-                                'booking2': b2
-                            })
+            conflicts.extend(room.detect_conflicts())
         
         return conflicts
     
     def add_log(self, log_type, message):
         """Add log entry"""
-        log_entry = {
+        self.logs.append({
             'type': log_type,
             'message': message,
-            'timestamp': datetime.now().isoformat()
-        }
-        self.logs.append(log_entry)
-        
-        # Keep only last 100 logs
-        if len(self.logs) > 100:
-            self.logs = self.logs[-100:]
+            'timestamp': _Timestamp(time.time_ns())
+        })
     
     def get_logs(self):
         """Get all logs"""
-        return list(reversed(self.logs))
+        with self._lock.gen_rlock():
+            return list(reversed(self.logs))
     
     def get_statistics(self):
         """Get system statistics"""
-        total_rooms = len(self.rooms)
-        total_bookings = sum(len(room.bookings) for room in self.rooms.values())
-        
-        # Calculate utilization
-        rooms_with_bookings = sum(1 for room in self.rooms.values() if len(room.bookings) > 0)
-        utilization_rate = (rooms_with_bookings / total_rooms * 100) if total_rooms > 0 else 0
-        
-        return {
-            'total_rooms': total_rooms,
-            'total_bookings': total_bookings,
-            'utilized_rooms': rooms_with_bookings,
-            'utilization_rate': round(utilization_rate, 2),
-            'conflicts': len(self.detect_conflicts())
-        }
+        with self._lock.gen_rlock():
+            total_rooms = len(self.rooms)
+            
+            # Calculate utilization
+            utilization_rate = (self._utilized_rooms / total_rooms * 100) if total_rooms > 0 else 0
+            
+            # Conflicts can only change when the system does
+            if self._conflicts_version != self.version:
+                self._conflicts_count = len(self._detect_conflicts())
+                self._conflicts_version = self.version
+            
+            return {
+                'total_rooms': total_rooms,
+                'total_bookings': self._total_bookings,
+                'utilized_rooms': self._utilized_rooms,
+                'utilization_rate': round(utilization_rate, 2),
+                'conflicts': self._conflicts_count
+            }
     
     def bfs_find_alternatives(self, start_room_id, date, start_time, end_time):
-        """Find alternative rooms using BFS traversal"""
-        if start_room_id not in self.rooms:
-            return []
-        
-        visited = set()
-        queue = deque([start_room_id])
-        alternatives = []
+        """
+        Find alternative rooms using BFS traversal
+        Returns: list of room dicts, or None if the times are malformed or out of order
+        """
+        try:
+            start_min, end_min = _to_time_range(start_time, end_time)
+        except ValueError:
+            return None
         
-        while queue:
-            current_id = queue.popleft()
-            
-            if current_id in visited:
-                continue
+        with self._lock.gen_rlock():
+            if start_room_id not in self.rooms:
+                return []
             
-            visited.add(current_id)
-            current_room = self.rooms[current_id]
+            start_index = self._room_index[start_room_id]
+            visited = bytearray(len(self._rooms_list))
+            visited[start_index] = 1
+            queue = deque([start_index])
+            alternatives = []
             
-            # Check if available
-            if current_room.is_available(date, start_time, end_time):
-                alternatives.append(current_room.to_dict())
+            while queue:
+                current_room = self._rooms_list[queue.popleft()]
+                
+                # Check if available
+                if current_room.is_available(date, start_min, end_min):
+                    alternatives.append(current_room.to_dict())
+                
+                # Add adjacent rooms to queue
+                for adjacent_index in current_room.adjacent_indices:
+                    if not visited[adjacent_index]:
+                        visited[adjacent_index] = 1
+                        queue.append(adjacent_index)
             
-            # Add adjacent rooms to queue
-            for adjacent_id in current_room.adjacent_rooms:
-                if adjacent_id not in visited:
-                    queue.append(adjacent_id)
-        
-        return alternatives
+            return alternatives
 
 
 # Initialize system
 classroom_system = ClassroomGraph()
 
 
-def initialize_sample_data():
+def initialize_sample_data(system):
     """Initialize with sample classroom data"""
     sample_rooms = [
         ('101', 'Main', 50, 1, {'projector': True, 'lab': False, 'accessible': True, 'whiteboard': True, 'audio': True, 'smartboard': False}),
@@ -301,14 +519,31 @@ def initialize_sample_data():
         ('AUD-1', 'Arts', 200, 1, {'projector': True, 'lab': False, 'accessible': True, 'whiteboard': False, 'audio': True, 'smartboard': False}),
     ]
     
-    for room_data in sample_rooms:
-        classroom_system.add_room(*room_data)
+    system.bulk_add_rooms(sample_rooms)
     
-    classroom_system.add_log('info', 'System initialized with sample data')
+    system.add_log('info', 'System initialized with sample data')
 
 
 # Initialize on startup
-initialize_sample_data()
+initialize_sample_data(classroom_system)
+
+
+# Distinguishes this process's ETags from those issued before a restart or reload
+_BOOT_ID = uuid.uuid4().hex
+
+
+def _versioned(view):
+    """Answer 304 Not Modified while the client's ETag matches the system version"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        etag = f"{_BOOT_ID}-{classroom_system.version}"
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = view(*args, **kwargs)
+        response.set_etag(etag, weak=True)
+        return response
+    return wrapper
 
 
 # API Routes
@@ -319,10 +554,11 @@ def health_check():
 
 
 @app.route('/api/rooms', methods=['GET'])
+@_versioned
 def get_rooms():
     """Get all rooms"""
     rooms = classroom_system.get_all_rooms()
-    return jsonify({'rooms': rooms})
+    return _json({'rooms': rooms})
 
 
 @app.route('/api/rooms', methods=['POST'])
@@ -376,11 +612,12 @@ def allocate_room():
 
 
 @app.route('/api/schedule', methods=['GET'])
+@_versioned
 def get_schedule():
     """Get all schedules"""
     room_id = request.args.get('room_id')
     schedules = classroom_system.get_schedule(room_id)
-    return jsonify({'schedules': schedules})
+    return _json({'schedules': schedules})
 
 
 @app.route('/api/alternatives/<room_id>', methods=['POST'])
@@ -395,6 +632,8 @@ def find_alternatives(room_id):
         data['end_time']
     )
     
+    if alternatives is None:
+        return jsonify({'error': 'Invalid time format'}), 400
     return jsonify({'alternatives': alternatives})
 
 
@@ -402,29 +641,34 @@ def find_alternatives(room_id):
 def detect_conflicts():
     """Detect scheduling conflicts"""
     conflicts = classroom_system.detect_conflicts()
-    return jsonify({'conflicts': conflicts})
+    return _json({'conflicts': conflicts})
 
 
 @app.route('/api/logs', methods=['GET'])
 def get_logs():
     """Get system logs"""
     logs = classroom_system.get_logs()
-    return jsonify({'logs': logs})
+    return _json({'logs': logs})
 
 
 @app.route('/api/statistics', methods=['GET'])
+@_versioned
 def get_statistics():
     """Get system statistics"""
     stats = classroom_system.get_statistics()
-    return jsonify(stats)
+    return _json(stats)
 
 
 @app.route('/api/reset', methods=['POST'])
 def reset_system():
     """Reset system with sample data"""
     global classroom_system
-    classroom_system = ClassroomGraph()
-    initialize_sample_data()
+    system = ClassroomGraph()
+    initialize_sample_data(system)
+    # Keep versions increasing across resets so stale ETags never match
+    system.version += classroom_system.version + 1
+    # Swap in the fully built graph so concurrent requests never see a partial one
+    classroom_system = system
     
     return jsonify({
         'success': True,
@@ -442,4 +686,7 @@ if __name__ == '__main__':
     print("=" * 70)
     print("\n  Press Ctrl+C to stop the server\n")
     
+    # Development server only. For deployment run a single worker process with
+    # threads (the graph's reader/writer lock keeps them consistent), e.g.:
+    #   gunicorn -w 1 -k gthread --threads 8 -b 0.0.0.0:5000 backend:app
     app.run(debug=True, host='0.0.0.0', port=5000)